@@ -5,7 +5,7 @@ A super simple FastAPI application that allows students to view and sign up
 for extracurricular activities at Mergington High School.
 """
 
-from fastapi import FastAPI, HTTPException
+from fastapi import Depends, FastAPI, HTTPException
 from fastapi.staticfiles import StaticFiles
 from fastapi.responses import RedirectResponse
 import os
@@ -19,77 +19,88 @@ current_dir = Path(__file__).parent
 app.mount("/static", StaticFiles(directory=os.path.join(Path(__file__).parent,
           "static")), name="static")
 
-# In-memory activity database
+# In-memory activity database (participants are insertion-ordered dicts of
+# emails, used as ordered sets)
 activities = {
     "Chess Club": {
         "description": "Learn strategies and compete in chess tournaments",
         "schedule": "Fridays, 3:30 PM - 5:00 PM",
         "max_participants": 12,
-        "participants": ["michael@mergington.edu", "daniel@mergington.edu"]
+        "participants": dict.fromkeys(["michael@mergington.edu", "daniel@mergington.edu"])
     },
     "Programming Class": {
         "description": "Learn programming fundamentals and build software projects",
         "schedule": "Tuesdays and Thursdays, 3:30 PM - 4:30 PM",
         "max_participants": 20,
-        "participants": ["emma@mergington.edu", "sophia@mergington.edu"]
+        "participants": dict.fromkeys(["emma@mergington.edu", "sophia@mergington.edu"])
     },
     "Gym Class": {
         "description": "Physical education and sports activities",
         "schedule": "Mondays, Wednesdays, Fridays, 2:00 PM - 3:00 PM",
         "max_participants": 30,
-        "participants": ["john@mergington.edu", "olivia@mergington.edu"]
+        "participants": dict.fromkeys(["john@mergington.edu", "olivia@mergington.edu"])
     },
     "Basketball Team": {
         "description": "Competitive basketball practice and games",
         "schedule": "Mondays and Wednesdays, 4:00 PM - 5:30 PM",
         "max_participants": 15,
-        "participants": ["alex@mergington.edu"]
+        "participants": dict.fromkeys(["alex@mergington.edu"])
     },
     "Tennis Club": {
         "description": "Learn and practice tennis skills",
         "schedule": "Saturdays, 10:00 AM - 11:30 AM",
         "max_participants": 8,
-        "participants": ["sarah@mergington.edu"]
+        "participants": dict.fromkeys(["sarah@mergington.edu"])
     },
     "Art Studio": {
         "description": "Explore painting, drawing, and mixed media",
         "schedule": "Wednesdays, 3:30 PM - 5:00 PM",
         "max_participants": 16,
-        "participants": ["grace@mergington.edu", "lucas@mergington.edu"]
+        "participants": dict.fromkeys(["grace@mergington.edu", "lucas@mergington.edu"])
     },
     "Music Ensemble": {
         "description": "Join our school band and orchestra",
         "schedule": "Tuesdays and Fridays, 4:00 PM - 5:00 PM",
         "max_participants": 25,
-        "participants": ["isabella@mergington.edu"]
+        "participants": dict.fromkeys(["isabella@mergington.edu"])
     },
     "Debate Team": {
         "description": "Develop argumentation and public speaking skills",
         "schedule": "Thursdays, 3:30 PM - 5:00 PM",
         "max_participants": 12,
-        "participants": ["marcus@mergington.edu", "noah@mergington.edu"]
+        "participants": dict.fromkeys(["marcus@mergington.edu", "noah@mergington.edu"])
     },
     "Science Club": {
         "description": "Conduct experiments and explore scientific concepts",
         "schedule": "Mondays, 3:30 PM - 4:30 PM",
         "max_participants": 18,
-        "participants": ["ava@mergington.edu"]
+        "participants": dict.fromkeys(["ava@mergington.edu"])
     }
 }
 
 
+def get_activity_store():
+    """Provide the activities store used by the endpoints"""
+    return activities
+
+
 @app.get("/")
 def root():
     return RedirectResponse(url="/static/index.html")
 
 
 @app.get("/activities")
-def get_activities():
-    return activities
+def get_activities(activities: dict = Depends(get_activity_store)):
+    # Participants are stored as ordered sets; send them as lists
+    return {
+        name: {**details, "participants": list(details["participants"])}
+        for name, details in activities.items()
+    }
 
 
 @app.post("/activities/{activity_name}/signup")
-def signup_for_activity(activity_name: str, email: str):
+def signup_for_activity(activity_name: str, email: str,
+                        activities: dict = Depends(get_activity_store)):
     """Sign up a student for an activity"""
     # Validate activity exists
     if activity_name not in activities:
@@ -104,12 +115,13 @@ def signup_for_activity(activity_name: str, email: str):
             status_code=400, detail="Student already signed up for this activity")
 
     # Add student
-    activity["participants"].append(email)
+    activity["participants"][email] = None
     return {"message": f"Signed up {email} for {activity_name}"}
 
 
 @app.delete("/activities/{activity_name}/unregister")
-def unregister_from_activity(activity_name: str, email: str):
+def unregister_from_activity(activity_name: str, email: str,
+                             activities: dict = Depends(get_activity_store)):
     """Unregister a student from an activity"""
     # Validate activity exists
     if activity_name not in activities:
@@ -124,5 +136,5 @@ def unregister_from_activity(activity_name: str, email: str):
             status_code=400, detail="Student is not registered for this activity")
 
     # Remove student
-    activity["participants"].remove(email)
+    del activity["participants"][email]
     return {"message": f"Unregistered {email} from {activity_name}"}